@@ -5,33 +5,122 @@ AudiMeta Client Module - Handle book metadata and chapter information retrieval
 Version: 1.0.7
 """
 
-import json
+import hashlib
+import os
+import time
 import requests
-from tabulate import tabulate
-from mutagen.mp3 import MP3
-from mutagen.id3 import ID3
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from mutagen.id3 import ID3, ID3NoHeaderError
+
+try:
+    import orjson
+    _loads = orjson.loads
+
+    def _dumps(obj):
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode('utf-8')
+except ImportError:
+    import json
+    _loads = json.loads
+
+    def _dumps(obj):
+        return json.dumps(obj, indent=2)
+
+def _print_table(table_data, headers):
+    """Print rows as a grid table; tabulate is only imported in verbose mode"""
+    from tabulate import tabulate
+    print(tabulate(table_data, headers=headers, tablefmt='grid'))
 
 class AudiMetaClient:
-    def __init__(self):
+    RESULT_HEADERS = ['#', 'Title', 'Author', 'Duration', 'Release', 'Publisher', 'Genres', 'ASIN']
+    _UNKNOWN_AUTHORS = ({'name': 'Unknown'},)
+    CACHE_TTL = 30 * 24 * 60 * 60
+
+    def __init__(self, use_cache=True, verbose=False):
         self.api_base_url = "https://audimeta.de"
+        self.verbose = verbose
         self.headers = {
             'User-Agent': 'AudioMetaSplitter/1.0.7',
-            'Accept': 'application/json'
+            'Accept': 'application/json',
+            'Accept-Encoding': 'gzip, deflate'
         }
+        self.timeout = (5, 30)
+        
+        # Reuse one keep-alive connection pool for all AudiMeta requests
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        # Retry transient server errors; the final response is still
+        # returned so the status checks below can report it
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=4,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.3,
+                status_forcelist=[429, 500, 502, 503, 504],
+                raise_on_status=False
+            )
+        )
+        self.session.mount('https://', adapter)
+        
+        self.use_cache = use_cache
+        self.cache_dir = os.path.join(os.path.expanduser('~'), '.cache', 'audimeta_splitter')
+
+    def close(self):
+        """Close the underlying HTTP session"""
+        self.session.close()
+
+    def _cache_path(self, key):
+        """Map a cache key to its file in the cache directory"""
+        return os.path.join(self.cache_dir, hashlib.sha1(key.encode('utf-8')).hexdigest() + '.json')
+
+    def _cache_get(self, key):
+        """Return the cached response body for key, or None on a miss or expired entry"""
+        if not self.use_cache:
+            return None
+        try:
+            with open(self._cache_path(key), 'rb') as f:
+                if time.time() - os.fstat(f.fileno()).st_mtime > self.CACHE_TTL:
+                    return None
+                return f.read()
+        except OSError:
+            return None
+
+    def _cache_put(self, key, body):
+        """Store a response body in the on-disk cache, even when reads are disabled"""
+        cache_file = self._cache_path(key)
+        temp_file = f"{cache_file}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(temp_file, 'wb') as f:
+                f.write(body)
+            os.replace(temp_file, cache_file)
+        except OSError as e:
+            print(f"Could not write cache entry: {str(e)}")
+
+    def _http_error(self, response):
+        """Describe a failed response from a short body snippet and release the connection"""
+        snippet = next(response.iter_content(2048), b'').decode('utf-8', 'replace')
+        response.close()
+        return f"HTTP {response.status_code}: {snippet}"
 
     def get_metadata_from_file(self, file_path):
         """Extract metadata from MP3 file to help identify the audiobook"""
         print(f"Extracting metadata from: {file_path}")
         try:
-            audio = MP3(file_path, ID3=ID3)
+            # Only the tags are needed, so skip parsing the MPEG stream
+            try:
+                tags = ID3(file_path)
+            except ID3NoHeaderError:
+                tags = None
             metadata = {}
             
-            if audio.tags:
-                title = str(audio.tags.get('TIT2', ''))
-                album = str(audio.tags.get('TALB', ''))
+            if tags:
+                title = str(tags.get('TIT2', ''))
+                album = str(tags.get('TALB', ''))
                 extracted_title = title or album
                 
-                author = str(audio.tags.get('TPE1', ''))
+                author = str(tags.get('TPE1', ''))
                 
                 if extracted_title:
                     metadata['title'] = extracted_title
@@ -59,7 +148,7 @@ class AudiMetaClient:
                 
                 metadata['region'] = 'US'
                 
-                print(f"Using metadata: {json.dumps(metadata, indent=2)}")
+                print(f"Using metadata: {_dumps(metadata)}")
                 return metadata
             else:
                 print("No ID3 tags found in the file.")
@@ -87,6 +176,11 @@ class AudiMetaClient:
             'region': 'US'
         }
 
+    @staticmethod
+    def _first_author_name(book):
+        """Return the name of the first listed author of a book"""
+        return (book.get('authors') or AudiMetaClient._UNKNOWN_AUTHORS)[0].get('name', 'Unknown')
+
     def display_search_results(self, results):
         """Display search results in a table format"""
         if not results:
@@ -97,7 +191,7 @@ class AudiMetaClient:
         for idx, book in enumerate(results, 1):
             try:
                 title = book.get('title', 'Unknown')
-                author = book.get('authors', [{'name': 'Unknown'}])[0].get('name', 'Unknown')
+                author = self._first_author_name(book)
                 duration = book.get('lengthMinutes', 'Unknown')
                 release_date = book.get('releaseDate', 'Unknown')
                 if release_date and release_date != 'Unknown':
@@ -105,17 +199,12 @@ class AudiMetaClient:
                 publisher = book.get('publisher', 'Unknown')
                 asin = book.get('asin', 'Unknown')
                 
-                genre_names = []
-                for genre in book.get('genres', []):
-                    if isinstance(genre, dict):
-                        genre_name = genre.get('name')
-                        if genre_name:
-                            genre_names.append(genre_name)
-                genres_str = ', '.join(genre_names)
+                genres_str = ', '.join(
+                    g['name'] for g in book.get('genres', [])
+                    if isinstance(g, dict) and g.get('name')
+                ) or 'Unknown'
                 if len(genres_str) > 50:
                     genres_str = genres_str[:47] + '...'
-                elif not genres_str:
-                    genres_str = 'Unknown'
                 
                 table_data.append([
                     idx,
@@ -133,9 +222,13 @@ class AudiMetaClient:
                 continue
         
         if table_data:
-            headers = ['#', 'Title', 'Author', 'Duration', 'Release', 'Publisher', 'Genres', 'ASIN']
             print("\nSearch Results:")
-            print(tabulate(table_data, headers=headers, tablefmt='grid'))
+            if self.verbose:
+                _print_table(table_data, self.RESULT_HEADERS)
+            else:
+                print(' | '.join(self.RESULT_HEADERS))
+                for row in table_data:
+                    print(' | '.join(str(value) for value in row))
             return len(table_data)
         else:
             print("No valid results to display.")
@@ -152,14 +245,17 @@ class AudiMetaClient:
         
         while True:
             try:
-                choice = input(f"\nSelect a book (1-{count}, or 0 to search manually): ")
+                choice = input(f"\nSelect a book (1-{count}, or 0 to search manually): ").strip()
                 if choice == '0':
                     return self.manual_search()
+                if not choice.isdigit():
+                    print("Please enter a valid number")
+                    continue
                 idx = int(choice) - 1
                 if 0 <= idx < len(results):
                     selected = results[idx]
                     title = selected.get('title', 'Unknown')
-                    author = selected.get('authors', [{'name': 'Unknown'}])[0].get('name', 'Unknown')
+                    author = self._first_author_name(selected)
                     print(f"\nSelected: {title} by {author}")
                     confirm = input("Is this correct? (y/n): ").lower()
                     if confirm == 'y':
@@ -196,13 +292,19 @@ class AudiMetaClient:
                 }
                 
                 print(f"\nSearching for: {title} by {author}")
-                response = requests.get(
+                response = self.session.get(
                     f"{self.api_base_url}/search",
                     params=params,
-                    headers=self.headers
+                    timeout=self.timeout,
+                    stream=True
                 )
-                response.raise_for_status()
-                results = response.json()
+                if response.status_code >= 400:
+                    print(f"Search error: {self._http_error(response)}")
+                    retry = input("Would you like to try again? (y/n): ").lower()
+                    if retry != 'y':
+                        return None
+                    continue
+                results = _loads(response.content)
                 
                 if results:
                     return self.get_user_choice(results)
@@ -238,18 +340,27 @@ class AudiMetaClient:
                 'localAuthor': search_params.get('author', '')
             }
             
-            print(f"Searching AudiMeta with parameters: {json.dumps(params, indent=2)}")
+            print(f"Searching AudiMeta with parameters: {_dumps(params)}")
             
-            response = requests.get(
+            cache_key = f"search:{_dumps(sorted(params.items()))}"
+            cached = self._cache_get(cache_key)
+            if cached is not None:
+                print("Using cached search results")
+                return self.get_user_choice(_loads(cached))
+            
+            response = self.session.get(
                 f"{self.api_base_url}/search",
                 params=params,
-                headers=self.headers
+                timeout=self.timeout,
+                stream=True
             )
-            response.raise_for_status()
-            
-            results = response.json()
+            if response.status_code >= 400:
+                print(f"Error fetching book metadata: {self._http_error(response)}")
+                return self.manual_search()
             
+            results = _loads(response.content)
             if results:
+                self._cache_put(cache_key, response.content)
                 return self.get_user_choice(results)
             else:
                 print("No matches found with file metadata.")
@@ -257,9 +368,6 @@ class AudiMetaClient:
                 
         except requests.exceptions.RequestException as e:
             print(f"Error fetching book metadata: {str(e)}")
-            if hasattr(e, 'response'):
-                print(f"Response status code: {e.response.status_code}")
-                print(f"Response content: {e.response.text}")
             return self.manual_search()
         except Exception as e:
             print(f"Error processing search results: {str(e)}")
@@ -269,56 +377,57 @@ class AudiMetaClient:
         """Fetch chapter information from AudiMeta API"""
         try:
             print(f"Fetching chapters for ASIN: {asin}")
-            response = requests.get(
-                f"{self.api_base_url}/chapters/{asin}",
-                headers=self.headers
-            )
-            response.raise_for_status()
+            cache_key = f"chapters:{asin}"
+            body = self._cache_get(cache_key)
+            from_cache = body is not None
+            
+            if from_cache:
+                print("Using cached chapter information")
+            else:
+                response = self.session.get(
+                    f"{self.api_base_url}/chapters/{asin}",
+                    timeout=self.timeout,
+                    stream=True
+                )
+                if response.status_code >= 400:
+                    print(f"Error fetching chapters: {self._http_error(response)}")
+                    return None
+                body = response.content
             
-            data = response.json()
+            data = _loads(body)
             
             if isinstance(data, dict) and 'chapters' in data:
                 chapters = data['chapters']
+                if not from_cache:
+                    self._cache_put(cache_key, body)
             else:
                 print(f"Unexpected chapter data format: {data}")
                 return None
                 
-            print(f"Found {len(chapters)} chapters")
-            
-            processed_chapters = []
-            for chapter in chapters:
-                processed_chapter = {
-                    'title': chapter.get('title', 'Unknown'),
+            processed_chapters = [
+                {
+                    'title': chapter.get('title') or f'Chapter {i}',
                     'start': chapter.get('startOffsetSec', 0),
                     'duration': int(chapter.get('lengthMs', 0) / 1000)
                 }
-                processed_chapters.append(processed_chapter)
+                for i, chapter in enumerate(chapters, 1)
+            ]
             
-            table_data = []
-            for i, chapter in enumerate(processed_chapters, 1):
-                try:
-                    title = chapter.get('title', f'Chapter {i}')
-                    start = chapter.get('start', 0)
-                    duration = chapter.get('duration', 0)
-                    table_data.append([i, title, start, duration])
-                except Exception as e:
-                    print(f"Error processing chapter {i} data: {str(e)}")
-                    print(f"Raw chapter data: {chapter}")
-                    return None
+            total_duration = sum(c['duration'] for c in processed_chapters)
+            print(f"Found {len(processed_chapters)} chapters; total {total_duration}s")
             
-            print("\nChapter Information:")
-            print(tabulate(
-                table_data,
-                headers=['#', 'Title', 'Start (s)', 'Duration (s)'],
-                tablefmt='grid'
-            ))
+            if self.verbose:
+                table_data = [
+                    [i, c['title'], c['start'], c['duration']]
+                    for i, c in enumerate(processed_chapters, 1)
+                ]
+                print("\nChapter Information:")
+                _print_table(table_data, ['#', 'Title', 'Start (s)', 'Duration (s)'])
             
             return processed_chapters
             
         except requests.exceptions.RequestException as e:
             print(f"Error fetching chapters: {str(e)}")
-            if hasattr(e, 'response'):
-                print(f"Response content: {e.response.text}")
         except Exception as e:
             print(f"Error processing chapter data: {str(e)}")
             print(f"Raw response data: {response.text if 'response' in locals() else 'No response'}")
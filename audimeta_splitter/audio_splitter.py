@@ -6,26 +6,59 @@ Version: 1.0.6
 """
 
 import os
+import shutil
 import subprocess
+import tempfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
-from mutagen.mp3 import MP3
-from mutagen.id3 import ID3, TIT2, TPE1, TALB, TRCK, TCON, TDRC
+from mutagen.id3 import ID3, ID3NoHeaderError, TIT2, TPE1, TALB, TRCK, TCON, TYER
 from .audimeta_client import AudiMetaClient
 
+# Characters not allowed in filenames on Windows/macOS, plus control characters
+_INVALID_FILENAME_CHARS = str.maketrans('', '', '<>:"/\\|?*' + ''.join(map(chr, range(32))))
+
+# ffmpeg input options for reading a concat demuxer list from stdin
+_CONCAT_PIPE_INPUT = [
+    '-f', 'concat',
+    '-safe', '0',
+    '-protocol_whitelist', 'file,pipe',
+    '-i', 'pipe:0'
+]
+
+def _fixed_tag_padding(info):
+    """Reserve 1 KB of ID3 padding"""
+    return 1024
+
 class AudioSplitter:
-    def __init__(self, folder_path):
+    def __init__(self, folder_path, use_cache=True, verbose=False, jobs=None, dry_run=False):
         self.folder_path = os.path.abspath(folder_path)
-        self.combined_file = "combined_temp.mp3"
-        self.audimeta_client = AudiMetaClient()
+        self.verbose = verbose
+        self.dry_run = dry_run
+        self.jobs = jobs or os.cpu_count() or 4
+        self.ffmpeg_path = shutil.which('ffmpeg')
+        self.ffprobe_path = shutil.which('ffprobe')
+        self.audimeta_client = AudiMetaClient(use_cache=use_cache, verbose=verbose)
         print(f"Initialized AudioSplitter for folder: {self.folder_path}")
 
+    def check_ffmpeg(self):
+        """Check that ffmpeg and ffprobe are available on the PATH"""
+        missing = [
+            name for name, path in (('ffmpeg', self.ffmpeg_path), ('ffprobe', self.ffprobe_path))
+            if path is None
+        ]
+        if missing:
+            print(f"Required tools not found on PATH: {', '.join(missing)}")
+            return False
+        return True
+
     def get_mp3_files(self):
         """Get all MP3 files in the specified folder"""
         try:
-            mp3_files = sorted([
-                f for f in os.listdir(self.folder_path) 
-                if f.lower().endswith('.mp3')
-            ])
+            with os.scandir(self.folder_path) as entries:
+                mp3_files = sorted(
+                    e.name for e in entries
+                    if e.is_file() and e.name.lower().endswith('.mp3')
+                )
             if mp3_files:
                 print(f"Found MP3 files: {', '.join(mp3_files)}")
             else:
@@ -35,167 +68,327 @@ class AudioSplitter:
             print(f"Error reading folder contents: {str(e)}")
             return []
 
-    def calculate_total_duration(self, mp3_files):
-        """Calculate total duration of all MP3 files"""
-        total_duration = 0
-        for mp3_file in mp3_files:
-            file_path = os.path.join(self.folder_path, mp3_file)
+    def _probe_duration(self, file_path):
+        """Read the duration of a file from its container header using ffprobe"""
+        cmd = [
+            self.ffprobe_path,
+            '-v', 'error',
+            '-show_entries', 'format=duration',
+            '-of', 'default=nw=1:nk=1',
+            file_path
+        ]
+        result = subprocess.run(
+            cmd,
+            capture_output=True,
+            text=True
+        )
+        if result.returncode != 0:
+            raise subprocess.CalledProcessError(
+                result.returncode,
+                cmd,
+                result.stdout,
+                result.stderr
+            )
+        return float(result.stdout)
+
+    def _fast_duration(self, file_path):
+        """Read the duration from the ID3 TLEN frame, probing the file only if it is missing"""
+        try:
+            # Only TLEN is needed: skip the ID3v1 read at the end of the file
+            # and the v2.4 frame translation pass
+            tlen = ID3(file_path, translate=False, load_v1=False).get('TLEN')
+            if tlen and str(tlen).isdigit():
+                return float(str(tlen)) / 1000
+        except Exception:
+            pass
+        return self._probe_duration(file_path)
+
+    def start_duration_probes(self, mp3_files):
+        """Start reading the duration of each MP3 file in the background, one future per file"""
+        max_workers = min(len(mp3_files), self.jobs) or 1
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+        futures = [
+            executor.submit(self._fast_duration, os.path.join(self.folder_path, mp3_file))
+            for mp3_file in mp3_files
+        ]
+        executor.shutdown(wait=False)
+        return futures
+
+    def collect_file_durations(self, mp3_files, futures):
+        """Wait for the duration probes and return the durations in file order"""
+        durations = []
+        for mp3_file, future in zip(mp3_files, futures):
             try:
-                audio = MP3(file_path)
-                total_duration += audio.info.length
+                durations.append(future.result())
             except Exception as e:
                 print(f"Error reading duration from {mp3_file}: {str(e)}")
                 raise
-        return total_duration
+        return durations
 
-    def combine_mp3_files(self, mp3_files):
-        """Combine multiple MP3 files into one using ffmpeg"""
-        if len(mp3_files) == 1:
-            print("Only one MP3 file found, no need to combine")
-            return mp3_files[0]
-            
-        print(f"Combining {len(mp3_files)} MP3 files...")
+    def files_match_chapters(self, file_durations, chapters, tolerance=1.0):
+        """Check whether each input file already holds exactly one chapter"""
+        if len(file_durations) != len(chapters):
+            return False
+        return all(
+            abs(file_duration - chapter.get('duration', 0)) < tolerance
+            for file_duration, chapter in zip(file_durations, chapters)
+        )
+
+    def build_concat_list(self, mp3_files):
+        """Build an ffmpeg concat demuxer list for the MP3 files, to be fed through stdin"""
+        lines = [
+            "file '{}'\n".format(os.path.join(self.folder_path, mp3).replace("'", "'\\''"))
+            for mp3 in mp3_files
+        ]
         
-        file_list = "files.txt"
-        output_file = os.path.join(self.folder_path, self.combined_file)
+        if self.verbose:
+            print("Concat list:")
+            print(''.join(lines))
         
-        try:
-            with open(file_list, 'w', encoding='utf-8') as f:
-                for mp3 in mp3_files:
-                    full_path = os.path.join(self.folder_path, mp3)
-                    escaped_path = full_path.replace("'", "'\\''")
-                    f.write(f"file '{escaped_path}'\n")
-            
-            print("Created concat file. Contents:")
-            with open(file_list, 'r') as f:
-                print(f.read())
-            
-            cmd = [
-                'ffmpeg', 
-                '-v', 'info',
-                '-f', 'concat', 
-                '-safe', '0',
-                '-i', file_list,
-                '-c', 'copy',
-                '-y',
-                output_file
-            ]
-            
-            print(f"Executing ffmpeg command:")
-            print(' '.join(cmd))
-            
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True
-            )
-            
-            if result.returncode != 0:
-                print("FFmpeg Error Output:")
-                print(result.stderr)
-                raise subprocess.CalledProcessError(
-                    result.returncode, 
-                    cmd,
-                    result.stdout, 
-                    result.stderr
-                )
-            
-            print("FFmpeg combination successful")
-            return self.combined_file
-            
-        except Exception as e:
-            print(f"Error during file combination: {str(e)}")
-            raise
-        finally:
-            if os.path.exists(file_list):
-                os.remove(file_list)
-                print("Cleaned up temporary files list")
+        return ''.join(lines).encode('utf-8')
 
-    def tag_file(self, file_path, chapter, track_num, total_tracks, book_metadata):
-        """Add ID3 tags to the split file"""
-        try:
-            audio = MP3(file_path, ID3=ID3)
-            if not audio.tags:
-                audio.tags = ID3()
-            
-            audio.tags.add(TIT2(encoding=3, text=chapter['title']))
-            audio.tags.add(TRCK(encoding=3, text=f"{track_num}/{total_tracks}"))
-            
-            audio.tags.add(TPE1(encoding=3, text=book_metadata.get('authors', [{'name': 'm.s. RedCherries'}])[0].get('name', 'm.s. RedCherries')))
-            audio.tags.add(TALB(encoding=3, text=book_metadata.get('title', 'Mother')))
-            
-            if 'releaseDate' in book_metadata:
-                audio.tags.add(TDRC(encoding=3, text=book_metadata['releaseDate'][:4]))
-            
-            if 'genres' in book_metadata and book_metadata['genres']:
-                genres = [g['name'] for g in book_metadata['genres'] if 'name' in g]
-                if genres:
-                    audio.tags.add(TCON(encoding=3, text=genres[0]))
-            
-            audio.save()
-            print(f"Added metadata tags to {os.path.basename(file_path)}")
-            
-        except Exception as e:
-            print(f"Error tagging file {file_path}: {str(e)}")
+    def build_common_frames(self, book_metadata):
+        """Build the ID3 frames shared by every chapter of the book"""
+        frames = [
+            TPE1(encoding=3, text=(book_metadata.get('authors') or [{'name': 'm.s. RedCherries'}])[0].get('name', 'm.s. RedCherries')),
+            TALB(encoding=3, text=book_metadata.get('title', 'Mother'))
+        ]
+        
+        if book_metadata.get('releaseDate'):
+            frames.append(TYER(encoding=3, text=book_metadata['releaseDate'][:4]))
+        
+        if 'genres' in book_metadata and book_metadata['genres']:
+            genres = [g['name'] for g in book_metadata['genres'] if 'name' in g]
+            if genres:
+                frames.append(TCON(encoding=3, text=genres[0]))
+        
+        return frames
+
+    def tag_file(self, file_path, chapter, track_num, total_tracks, common_frames, keep_existing=False):
+        """Add ID3 tags to the split file; raises if the tags cannot be written"""
+        # Freshly split chapters carry no tag worth reading; original
+        # files renamed in place keep theirs (e.g. cover art)
+        tags = ID3()
+        if keep_existing:
+            try:
+                tags = ID3(file_path)
+                tags.update_to_v23()
+            except ID3NoHeaderError:
+                pass
+        
+        # Only the title and track number differ between chapters
+        tags.add(TIT2(encoding=3, text=chapter['title']))
+        tags.add(TRCK(encoding=3, text=f"{track_num}/{total_tracks}"))
+        for frame in common_frames:
+            tags.add(frame)
+        
+        # Fresh tags reserve fixed padding so later edits need no
+        # rewrite; existing tags keep mutagen's default, which avoids
+        # shifting the audio of an original file
+        padding = None if keep_existing else _fixed_tag_padding
+        tags.save(file_path, v2_version=3, padding=padding)
 
     def sanitize_filename(self, filename):
         """Remove invalid characters from filename"""
-        invalid_chars = '<>:"/\\|?*'
-        filename = ''.join(c for c in filename if c not in invalid_chars)
-        filename = filename.strip()
-        return filename[:200] if len(filename) > 200 else filename
+        return filename.translate(_INVALID_FILENAME_CHARS).strip(' .')[:200]
 
-    def split_by_chapters(self, input_file, chapters, book_metadata):
-        """Split the combined file according to chapter information"""
-        input_path = os.path.join(self.folder_path, input_file)
-        
-        print(f"Splitting into {len(chapters)} chapters...")
-        successful_splits = 0
+    def validate_chapters(self, chapters, total_duration):
+        """Check the chapter layout against the audio before any file is touched"""
+        previous_start = None
+        for i, chapter in enumerate(chapters, 1):
+            start = chapter.get('start')
+            duration = chapter.get('duration')
+            if not isinstance(start, (int, float)) or not isinstance(duration, (int, float)):
+                print(f"Chapter {i} has no valid start time or duration: {chapter}")
+                return False
+            if start < 0 or duration < 0:
+                print(f"Chapter {i} has a negative start time or duration: {chapter}")
+                return False
+            if previous_start is not None and start <= previous_start:
+                print(f"Chapter {i} does not start after chapter {i - 1}")
+                return False
+            previous_start = start
         
+        if previous_start is not None and previous_start >= total_duration:
+            print(f"Last chapter starts at {previous_start}s, after the end of the audio ({int(total_duration)}s)")
+            return False
+        return True
+
+    def print_plan(self, chapters, in_place):
+        """Print the planned chapter layout without touching any files"""
+        action = "rename and tag in place" if in_place else "split"
+        print(f"\nDry run: would {action} into {len(chapters)} chapters")
         for i, chapter in enumerate(chapters, 1):
+            output_name = os.path.basename(self.chapter_output_path(i, chapter))
+            print(f"{i:>3}  start {chapter['start']:>7}s  duration {chapter['duration']:>6}s  {output_name}")
+
+    def can_rename_in_place(self, original_files, chapters):
+        """Check that renaming the originals to chapter names overwrites nothing"""
+        for i, (file_path, chapter) in enumerate(zip(original_files, chapters), 1):
+            output_file = self.chapter_output_path(i, chapter)
+            if output_file != file_path and os.path.exists(output_file):
+                print(f"Cannot rename in place, {os.path.basename(output_file)} already exists")
+                return False
+        return True
+
+    def retag_in_place(self, original_files, chapters, book_metadata):
+        """Rename and tag original files that each already hold one chapter"""
+        common_frames = self.build_common_frames(book_metadata)
+        successful_renames = 0
+        
+        for i, (file_path, chapter) in enumerate(zip(original_files, chapters), 1):
             try:
-                title = chapter.get('title', f'Chapter {i}')
-                start = str(chapter.get('start', 0))
-                duration = str(chapter.get('duration', 0))
-                
-                safe_title = self.sanitize_filename(title)
-                output_file = os.path.join(
-                    self.folder_path,
-                    f"{i:02d}_{safe_title}.mp3"
-                )
-                
-                cmd = [
-                    'ffmpeg',
-                    '-i', input_path,
-                    '-ss', start,
-                    '-t', duration,
-                    '-c', 'copy',
-                    '-y',
-                    output_file
-                ]
-                
-                print(f"\nProcessing chapter {i}/{len(chapters)}: {safe_title}")
-                print(f"Start time: {start}s, Duration: {duration}s")
-                
-                result = subprocess.run(
-                    cmd,
-                    capture_output=True,
-                    text=True
-                )
-                
-                if result.returncode != 0:
-                    print(f"Error splitting chapter {i}:")
-                    print(result.stderr)
-                    continue
-                
-                self.tag_file(output_file, chapter, i, len(chapters), book_metadata)
-                print(f"Created chapter {i:02d}: {safe_title}")
-                successful_splits += 1
-                
+                output_file = self.chapter_output_path(i, chapter)
+                os.rename(file_path, output_file)
+                self.tag_file(output_file, chapter, i, len(chapters), common_frames, keep_existing=True)
+                print(f"Created chapter {i:02d}: {os.path.basename(output_file)}")
+                successful_renames += 1
             except Exception as e:
                 print(f"Error processing chapter {i}: {str(e)}")
                 print(f"Chapter data: {chapter}")
-                continue
+        
+        return successful_renames == len(chapters)
+
+    def chapter_output_path(self, i, chapter):
+        """Build the output path for chapter number i"""
+        safe_title = self.sanitize_filename(chapter.get('title', f'Chapter {i}'))
+        return os.path.join(self.folder_path, f"{i:02d}_{safe_title}.mp3")
+
+    def _run_with_progress(self, cmd, input_data=None, total_duration=None):
+        """Run an ffmpeg command that writes -progress to stdout, printing every 10%"""
+        # stderr goes to a file so a chatty ffmpeg cannot block on a full
+        # pipe while stdout is being read
+        with tempfile.TemporaryFile() as stderr_file:
+            with subprocess.Popen(
+                cmd,
+                stdin=subprocess.PIPE if input_data is not None else None,
+                stdout=subprocess.PIPE,
+                stderr=stderr_file
+            ) as process:
+                try:
+                    if input_data is not None:
+                        try:
+                            process.stdin.write(input_data)
+                            process.stdin.close()
+                        except BrokenPipeError:
+                            # ffmpeg exited early; its stderr says why
+                            try:
+                                process.stdin.close()
+                            except BrokenPipeError:
+                                pass
+                    
+                    reported = 0
+                    for line in process.stdout:
+                        key, _, value = line.decode('ascii', 'replace').strip().partition('=')
+                        # out_time_ms is in microseconds too, for older ffmpeg builds
+                        if key in ('out_time_us', 'out_time_ms') and value.isdigit() and total_duration:
+                            percent = min(100, int(int(value) / 1000000 / total_duration * 100))
+                            if percent >= reported + 10:
+                                reported = percent - percent % 10
+                                print(f"Split progress: {reported}%")
+                except BaseException:
+                    # Don't leave ffmpeg running on Ctrl-C or a failed read
+                    process.kill()
+                    raise
+                
+                returncode = process.wait()
+            stderr_file.seek(0)
+            return returncode, stderr_file.read().decode('utf-8', 'replace')
+
+    def split_by_chapters(self, input_args, chapters, book_metadata, input_data=None, total_duration=None):
+        """Split the ffmpeg input given by input_args according to chapter information"""
+        print(f"Splitting into {len(chapters)} chapters...")
+        successful_splits = 0
+        split_files = []
+        
+        # A single segment muxer pass replaces one ffmpeg process per chapter
+        segment_times = ",".join(str(c.get('start', 0)) for c in chapters[1:])
+        
+        # Resolve every output name before spending time in ffmpeg
+        output_files = [
+            self.chapter_output_path(i, chapter)
+            for i, chapter in enumerate(chapters, 1)
+        ]
+        existing = [f for f in output_files if os.path.exists(f)]
+        if existing:
+            print("Chapter files already exist, refusing to overwrite them:")
+            for output_file in existing:
+                print(f"  {os.path.basename(output_file)}")
+            return False
+        
+        # Bad metadata should fail here, not after ffmpeg has written the files
+        common_frames = self.build_common_frames(book_metadata)
+        
+        # Segments go to a private directory so concurrent runs, or files
+        # that happen to share the segment names, cannot collide
+        segment_dir = tempfile.mkdtemp(prefix='.segments_', dir=self.folder_path)
+        segment_pattern = os.path.join(segment_dir, "chapter_%03d.mp3")
+        
+        try:
+            cmd = [
+                self.ffmpeg_path,
+                '-v', 'error',
+                '-nostats',
+                '-progress', 'pipe:1',
+                *input_args,
+                # Copy only the first audio stream: cover art and source
+                # metadata are dropped since every chapter is retagged
+                '-map', '0:a:0',
+                '-vn', '-sn', '-dn',
+                '-c:a', 'copy',
+                '-map_metadata', '-1',
+                '-f', 'segment',
+                '-segment_format', 'mp3',
+                '-reset_timestamps', '1',
+                '-y'
+            ]
+            if segment_times:
+                cmd.extend(['-segment_times', segment_times])
+            cmd.append(segment_pattern)
+            
+            print(f"Executing ffmpeg command:")
+            print(' '.join(cmd))
+            
+            returncode, stderr = self._run_with_progress(cmd, input_data, total_duration)
+            
+            if returncode != 0:
+                print("Error splitting into chapters:")
+                print(stderr)
+                return False
+            
+            for i, (chapter, output_file) in enumerate(zip(chapters, output_files), 1):
+                try:
+                    segment_file = segment_pattern % (i - 1)
+                    
+                    if not os.path.exists(segment_file):
+                        print(f"Error splitting chapter {i}: ffmpeg produced no segment")
+                        continue
+                    
+                    os.replace(segment_file, output_file)
+                    split_files.append((i, chapter, output_file))
+                    
+                except Exception as e:
+                    print(f"Error processing chapter {i}: {str(e)}")
+                    print(f"Chapter data: {chapter}")
+                    continue
+        finally:
+            shutil.rmtree(segment_dir, ignore_errors=True)
+        
+        # Every chapter is a distinct file, so tag them concurrently
+        max_workers = min(len(split_files), self.jobs) or 1
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(self.tag_file, output_file, chapter, i, len(chapters), common_frames): (i, output_file)
+                for i, chapter, output_file in split_files
+            }
+            for future in as_completed(futures):
+                i, output_file = futures[future]
+                try:
+                    future.result()
+                    print(f"Created chapter {i:02d}: {os.path.basename(output_file)}")
+                    successful_splits += 1
+                except Exception as e:
+                    print(f"Error tagging chapter {i} ({os.path.basename(output_file)}): {str(e)}")
                 
         return successful_splits == len(chapters)
 
@@ -204,8 +397,12 @@ class AudioSplitter:
         start_time = datetime.utcnow()
         print(f"\nStarting process at {start_time.strftime('%Y-%m-%d %H:%M:%S')} UTC")
         print(f"Processing folder: {self.folder_path}")
+        duration_futures = []
         
         try:
+            if not self.check_ffmpeg():
+                return False
+            
             # Get and validate MP3 files
             mp3_files = self.get_mp3_files()
             if not mp3_files:
@@ -223,11 +420,11 @@ class AudioSplitter:
                 print("Could not extract metadata from file")
                 return False
             
-            # Calculate total duration
-            print("Calculating total duration...")
-            total_duration = self.calculate_total_duration(mp3_files)
-            metadata['lengthMinutes'] = int(total_duration / 60)
-            print(f"Total duration: {metadata['lengthMinutes']} minutes")
+            # The search does not need the durations, so probe the files in
+            # the background while the book is looked up and confirmed;
+            # errors are only reported once the results are collected
+            print("Calculating total duration in the background...")
+            duration_futures = self.start_duration_probes(mp3_files)
             
             # Search for book and get user confirmation
             print("Searching for book in AudiMeta...")
@@ -243,39 +440,61 @@ class AudioSplitter:
                 print("Could not fetch chapter information")
                 return False
             
-            # Combine files if necessary
-            if len(mp3_files) > 1:
-                print("Combining MP3 files...")
-                combined_file = self.combine_mp3_files(mp3_files)
-            else:
-                combined_file = mp3_files[0]
+            file_durations = self.collect_file_durations(mp3_files, duration_futures)
+            total_duration = sum(file_durations)
+            print(f"Total duration: {int(total_duration / 60)} minutes")
             
-            # Split the combined file into chapters
-            splitting_successful = self.split_by_chapters(combined_file, chapters, book_metadata)
+            # Catch a malformed chapter list before any ffmpeg work starts
+            if not self.validate_chapters(chapters, total_duration):
+                print("Chapter information does not match the audio files")
+                return False
+            
+            # When every file already is one chapter there is nothing to
+            # concatenate or split, so skip rewriting the audio entirely
+            in_place = (
+                self.files_match_chapters(file_durations, chapters)
+                and self.can_rename_in_place(original_files, chapters)
+            )
+            
+            if self.dry_run:
+                self.print_plan(chapters, in_place)
+                return True
+            
+            if in_place:
+                print("\nFiles already match the chapters. Renaming and tagging in place...")
+                splitting_successful = self.retag_in_place(original_files, chapters, book_metadata)
+            else:
+                # Feed multiple files through the concat demuxer rather than
+                # writing a combined copy of the whole book to disk
+                input_data = None
+                if len(mp3_files) > 1:
+                    input_data = self.build_concat_list(mp3_files)
+                    input_args = _CONCAT_PIPE_INPUT
+                else:
+                    input_args = ['-i', original_files[0]]
+                
+                # Split the input into chapters
+                splitting_successful = self.split_by_chapters(
+                    input_args,
+                    chapters,
+                    book_metadata,
+                    input_data,
+                    total_duration
+                )
             
-            # Clean up files
+            # Clean up files; renamed originals are the chapters themselves
             cleanup_successful = True
-            if splitting_successful:
+            if splitting_successful and not in_place:
                 print("\nSplitting completed successfully. Cleaning up original files...")
                 for file_path in original_files:
                     try:
-                        if os.path.exists(file_path):
-                            os.remove(file_path)
-                            print(f"Removed original file: {os.path.basename(file_path)}")
-                    except Exception as e:
+                        os.remove(file_path)
+                        print(f"Removed original file: {os.path.basename(file_path)}")
+                    except FileNotFoundError:
+                        pass
+                    except OSError as e:
                         print(f"Error removing file {file_path}: {str(e)}")
                         cleanup_successful = False
-                
-                # Clean up combined file if it was created
-                if len(mp3_files) > 1:
-                    cleanup_file = os.path.join(self.folder_path, self.combined_file)
-                    if os.path.exists(cleanup_file):
-                        try:
-                            os.remove(cleanup_file)
-                            print("Cleaned up combined temporary file")
-                        except Exception as e:
-                            print(f"Error removing combined file: {str(e)}")
-                            cleanup_successful = False
             
             end_time = datetime.utcnow()
             duration = end_time - start_time
@@ -297,6 +516,11 @@ class AudioSplitter:
         except Exception as e:
             print(f"An error occurred during processing: {str(e)}")
             return False
+        finally:
+            # Drop probes that have not started so an early exit does not
+            # wait for the whole folder to be probed
+            for future in duration_futures:
+                future.cancel()
 
 def main():
     import argparse
@@ -313,11 +537,38 @@ def main():
         action='store_true',
         help='Enable verbose output'
     )
+    parser.add_argument(
+        '--jobs', '-j',
+        type=int,
+        default=None,
+        help='Number of parallel workers (default: number of CPUs)'
+    )
+    parser.add_argument(
+        '--dry-run',
+        action='store_true',
+        help='Show the planned chapter layout without splitting or renaming files'
+    )
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Ignore cached AudiMeta responses (fresh responses are still cached)'
+    )
     
     args = parser.parse_args()
+    if args.jobs is not None and args.jobs < 1:
+        parser.error('--jobs must be at least 1')
     
-    splitter = AudioSplitter(args.folder_path)
-    success = splitter.process_folder()
+    splitter = AudioSplitter(
+        args.folder_path,
+        use_cache=not args.no_cache,
+        verbose=args.verbose,
+        jobs=args.jobs,
+        dry_run=args.dry_run
+    )
+    try:
+        success = splitter.process_folder()
+    finally:
+        splitter.audimeta_client.close()
     exit(0 if success else 1)
 
 if __name__ == "__main__":
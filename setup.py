@@ -31,6 +31,9 @@ setup(
         "mutagen>=1.45.0",
         "tabulate>=0.8.0"
     ],
+    extras_require={
+        "speedups": ["orjson>=3.0"],
+    },
     entry_points={
         'console_scripts': [
             'audimeta_splitter=audimeta_splitter.audio_splitter:main',